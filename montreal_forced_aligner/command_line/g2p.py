@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 import shutil
+import sys
 from typing import TYPE_CHECKING, Optional
 
 from montreal_forced_aligner.command_line.utils import validate_model_arg
@@ -10,6 +11,7 @@ from montreal_forced_aligner.config import TEMP_DIR
 from montreal_forced_aligner.config.g2p_config import g2p_yaml_to_config, load_basic_g2p_config
 from montreal_forced_aligner.corpus import Corpus
 from montreal_forced_aligner.dictionary import check_bracketed
+from montreal_forced_aligner.g2p.generator import G2P_DISABLED
 from montreal_forced_aligner.g2p.generator import PyniniDictionaryGenerator as Generator
 from montreal_forced_aligner.models import G2PModel
 from montreal_forced_aligner.utils import setup_logger
@@ -147,5 +149,11 @@ def run_g2p(args: Namespace, unknown: Optional[list] = None) -> None:
     unknown: List[str]
         Parsed command line arguments to be passed to the configuration objects
     """
+    if G2P_DISABLED:
+        print(
+            "There was an issue importing Pynini, please ensure that it is installed. If you are on Windows, "
+            "please use the Windows Subsystem for Linux to use g2p functionality."
+        )
+        sys.exit(1)
     validate_args(args)
     generate_dictionary(args, unknown)
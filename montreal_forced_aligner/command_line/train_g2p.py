@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 import shutil
+import sys
 from typing import TYPE_CHECKING, Optional
 
 from montreal_forced_aligner.command_line.utils import validate_model_arg
@@ -12,6 +13,7 @@ from montreal_forced_aligner.config.train_g2p_config import (
     train_g2p_yaml_to_config,
 )
 from montreal_forced_aligner.dictionary import Dictionary
+from montreal_forced_aligner.g2p.trainer import G2P_DISABLED
 from montreal_forced_aligner.g2p.trainer import PyniniTrainer as Trainer
 
 if TYPE_CHECKING:
@@ -89,5 +91,11 @@ def run_train_g2p(args: Namespace, unknown: Optional[list] = None) -> None:
     unknown: List[str]
         Parsed command line arguments to be passed to the configuration objects
     """
+    if G2P_DISABLED:
+        print(
+            "There was an issue importing Pynini, please ensure that it is installed. If you are on Windows, "
+            "please use the Windows Subsystem for Linux to use g2p functionality."
+        )
+        sys.exit(1)
     validate_args(args)
     train_g2p(args, unknown)
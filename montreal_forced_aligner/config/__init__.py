@@ -1,13 +1,16 @@
 """Class definitions for configuring MFA"""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from argparse import Namespace
 
     ConfigDict = Dict[str, Any]
+import functools
+import json
 import os
+from datetime import datetime
 
 import yaml
 
@@ -62,29 +65,105 @@ def generate_command_history_path() -> str:
     str
         Full path to history file
     """
-    return os.path.join(TEMP_DIR, "command_history.yaml")
+    return os.path.join(TEMP_DIR, "command_history.jsonl")
 
 
-def load_command_history() -> List[str]:
+def _migrate_command_history(path: str) -> None:
+    """
+    Convert the YAML command history used by earlier versions of MFA to JSON lines
+
+    Parameters
+    ----------
+    path: str
+        Path to the JSON lines history file
+    """
+    legacy_path = os.path.join(os.path.dirname(path), "command_history.yaml")
+    if os.path.exists(path) or not os.path.exists(legacy_path):
+        return
+    try:
+        with open(legacy_path, "r", encoding="utf8") as f:
+            history = yaml.safe_load(f)
+    except yaml.YAMLError:
+        return
+    if not isinstance(history, list):
+        return
+    with open(path, "w", encoding="utf8") as f:
+        for command_data in history:
+            f.write(json.dumps(command_data, default=str) + "\n")
+
+
+def _read_last_lines(path: str, num_lines: int, chunk_size: int = 8192) -> List[bytes]:
+    """
+    Read the last lines of a file by reading backwards from its end in chunks
+
+    Parameters
+    ----------
+    path: str
+        Path to file
+    num_lines: int
+        Number of lines to read
+    chunk_size: int
+        Number of bytes to read at a time
+
+    Returns
+    -------
+    List[bytes]
+        Last lines of the file
+    """
+    if num_lines <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= num_lines:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    return data.splitlines()[-num_lines:]
+
+
+def load_command_history(depth: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Load command history for MFA
 
+    Parameters
+    ----------
+    depth: int, optional
+        Number of most recent commands to load, defaults to all saved commands
+
     Returns
     -------
     List
         List of commands previously run
     """
     path = generate_command_history_path()
+    _migrate_command_history(path)
+    if not os.path.exists(path):
+        return []
+    if depth is None:
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+    else:
+        lines = _read_last_lines(path, depth)
     history = []
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf8") as f:
-            history = yaml.safe_load(f)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            data["date"] = datetime.fromisoformat(data["date"])
+        except (ValueError, KeyError, TypeError):
+            continue  # Skip lines truncated by an interrupted write
+        history.append(data)
     return history
 
 
 def update_command_history(command_data: dict) -> None:
     """
-    Update command history with most recent command
+    Update command history with most recent command.  Commands are appended to the history file
+    as JSON lines, and the file is trimmed to the most recent 50 commands once it grows past 1 MB
 
     Parameters
     ----------
@@ -96,12 +175,16 @@ def update_command_history(command_data: dict) -> None:
             return
     except Exception:
         return
-    history = load_command_history()
     path = generate_command_history_path()
-    history.append(command_data)
-    history = history[-50:]
-    with open(path, "w", encoding="utf8") as f:
-        yaml.safe_dump(history, f)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _migrate_command_history(path)
+    with open(path, "a", encoding="utf8") as f:
+        f.write(json.dumps(command_data, default=str) + "\n")
+        size = f.tell()
+    if size > 1 << 20:
+        lines = _read_last_lines(path, 50)
+        with open(path, "wb") as f:
+            f.write(b"\n".join(lines) + b"\n")
 
 
 def update_global_config(args: Namespace) -> None:
@@ -169,6 +252,29 @@ def update_global_config(args: Namespace) -> None:
         default_config["temp_directory"] = args.temp_directory
     with open(global_configuration_file, "w", encoding="utf8") as f:
         yaml.dump(default_config, f)
+    _read_global_config_file.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _read_global_config_file(path: str, stat_key: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    Parse the global configuration file, cached on the file's modification time and size
+    so that repeated loads in a single session don't re-parse the YAML
+
+    Parameters
+    ----------
+    path: str
+        Path to global configuration yaml
+    stat_key: Tuple[int, int]
+        Modification time (in ns) and size of the file
+
+    Returns
+    -------
+    Dict
+        Parsed configuration
+    """
+    with open(path, "r", encoding="utf8") as f:
+        return yaml.safe_load(f)
 
 
 def load_global_config() -> Dict[str, Any]:
@@ -194,10 +300,12 @@ def load_global_config() -> Dict[str, Any]:
         "use_mp": True,
         "temp_directory": TEMP_DIR,
     }
-    if os.path.exists(global_configuration_file):
-        with open(global_configuration_file, "r", encoding="utf8") as f:
-            data = yaml.safe_load(f)
-            default_config.update(data)
+    try:
+        stat = os.stat(global_configuration_file)
+    except FileNotFoundError:
+        return default_config
+    data = _read_global_config_file(global_configuration_file, (stat.st_mtime_ns, stat.st_size))
+    default_config.update(data)
     return default_config
 
 
@@ -35,6 +35,8 @@ class BaseConfig:
     Base configuration class
     """
 
+    __slots__ = ()
+
     def update(self, data: dict) -> None:
         """Update configuration parameters"""
         for k, v in data.items():
@@ -1,13 +1,21 @@
 """Class definitions for configuring language model training"""
 from __future__ import annotations
 
+import copy
+import functools
 import os
+from typing import Any, Dict
 
 import yaml
 
 from .base_config import BaseConfig
 
-__all__ = ["TrainLMConfig", "train_lm_yaml_to_config", "load_basic_train_lm"]
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+__all__ = ["TrainLMConfig", "train_lm_yaml_to_config", "load_basic_train_lm", "clear_cache"]
 
 
 class TrainLMConfig(BaseConfig):
@@ -25,6 +33,16 @@ class TrainLMConfig(BaseConfig):
     use_mp: bool
     """
 
+    __slots__ = (
+        "order",
+        "method",
+        "prune",
+        "count_threshold",
+        "prune_thresh_small",
+        "prune_thresh_medium",
+        "use_mp",
+    )
+
     def __init__(self):
         self.order = 3
         self.method = "kneser_ney"
@@ -35,6 +53,34 @@ class TrainLMConfig(BaseConfig):
         self.use_mp = True
 
 
+@functools.lru_cache(maxsize=None)
+def _load_yaml_cached(path: str, mtime: int) -> Dict[str, Any]:
+    """
+    Parse a language model training yaml, cached on its absolute path and modification time
+
+    Parameters
+    ----------
+    path: str
+        Absolute path to yaml file
+    mtime: int
+        Modification time of the file (in ns)
+
+    Returns
+    -------
+    Dict
+        Parsed configuration data
+    """
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def clear_cache() -> None:
+    """
+    Clear the cache of parsed language model training configurations
+    """
+    _load_yaml_cached.cache_clear()
+
+
 def train_lm_yaml_to_config(path: str) -> TrainLMConfig:
     """
     Helper function to load language model training configurations
@@ -49,10 +95,10 @@ def train_lm_yaml_to_config(path: str) -> TrainLMConfig:
     :class:`~montreal_forced_aligner.config.train_lm_config.TrainLMConfig`
         Language model training configuration
     """
-    with open(path, "r", encoding="utf8") as f:
-        data = yaml.load(f, Loader=yaml.SafeLoader)
-        config = TrainLMConfig()
-        config.update(data)
+    path = os.path.abspath(path)
+    data = _load_yaml_cached(path, os.stat(path).st_mtime_ns)
+    config = TrainLMConfig()
+    config.update(copy.deepcopy(data))
     return config
 
 
@@ -46,6 +46,7 @@ ReversedMappingType = Dict[int, str]
 WordsType = Dict[str, DictionaryEntryType]
 MappingType = Dict[str, int]
 MultiSpeakerMappingType = Dict[str, str]
+PrefixTableType = Tuple[Dict[Tuple[str, ...], List[Tuple[int, Dict[str, Any]]]], List[int]]
 
 __all__ = [
     "compile_graphemes",
@@ -239,6 +240,9 @@ def parse_ipa(
 class DictionaryData(NamedTuple):
     """
     Information required for parsing Kaldi-internal ids to text
+
+    The look up caches are filled in as text is parsed against this data, so each
+    DictionaryData should be constructed with its own empty caches
     """
 
     silences: Set[str]
@@ -254,6 +258,9 @@ class DictionaryData(NamedTuple):
     oov_int: int
     oov_code: str
     words: WordsType
+    lookup_cache: Dict[str, Tuple[str, ...]]
+    int_cache: Dict[str, Tuple[int, ...]]
+    prefix_tables: Dict[str, PrefixTableType]
 
 
 class Dictionary:
@@ -548,6 +555,9 @@ class Dictionary:
             self.oov_int,
             self.oov_code,
             words,
+            {},
+            {},
+            {},
         )
 
     def cleanup_logger(self) -> None:
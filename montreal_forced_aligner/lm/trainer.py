@@ -4,11 +4,13 @@ from __future__ import annotations
 import logging
 import os
 import re
+import signal
 import subprocess
-from typing import TYPE_CHECKING, Dict, Optional, Union
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Union
 
 from ..config import TEMP_DIR
 from ..corpus import Corpus
+from ..exceptions import LMError
 from ..models import LanguageModel
 
 if TYPE_CHECKING:
@@ -18,6 +20,79 @@ if TYPE_CHECKING:
 
 __all__ = ["LmTrainer"]
 
+_RE_SENTENCES = re.compile(r"(\d+) sentences")
+_RE_WORDS = re.compile(r"(\d+) words")
+_RE_OOVS = re.compile(r"(\d+) OOVs")
+_RE_PPL = re.compile(r"perplexity = ([\d.]+)")
+
+_LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+
+
+def _lowercase_arpa(inf: BinaryIO, outf: BinaryIO, chunk_size: int = 1 << 20) -> None:
+    """
+    Copy an ARPA file in chunks, lower casing it and normalizing line endings to ``\\n``
+
+    Parameters
+    ----------
+    inf: BinaryIO
+        ARPA file opened in binary mode
+    outf: BinaryIO
+        Stream to write the lower cased ARPA to
+    chunk_size: int
+        Number of bytes to read at a time
+    """
+    carry = b""
+    while True:
+        chunk = inf.read(chunk_size)
+        if not chunk:
+            break
+        chunk = carry + chunk
+        ascii_chunk = chunk.isascii()
+        if not ascii_chunk:
+            # Finish the current line so multi-byte characters aren't split
+            chunk += inf.readline()
+        # Hold back a trailing carriage return in case the next chunk starts with its line feed
+        if chunk.endswith(b"\r"):
+            chunk, carry = chunk[:-1], b"\r"
+        else:
+            carry = b""
+        if ascii_chunk:
+            chunk = chunk.translate(_LOWER)
+        else:
+            chunk = chunk.decode("utf8").lower().encode("utf8")
+        outf.write(chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+    if carry:
+        outf.write(b"\n")
+
+
+def _wait_for_processes(procs: List[subprocess.Popen], log_path: str) -> None:
+    """
+    Wait for all processes to finish before checking their exit codes
+
+    Parameters
+    ----------
+    procs: List[:class:`~subprocess.Popen`]
+        Processes to wait on, in pipeline order
+    log_path: str
+        Path to the log file the processes write to
+
+    Raises
+    ------
+    :class:`~montreal_forced_aligner.exceptions.LMError`
+        If any of the processes failed
+    """
+    for proc in procs:
+        proc.wait()
+    failed = [proc for proc in procs if proc.returncode]
+    if not failed:
+        return
+    # A producer killed by a broken pipe only failed because the process reading from it did
+    sigpipe = getattr(signal, "SIGPIPE", None)
+    proc = next((x for x in failed if sigpipe is None or x.returncode != -sigpipe), failed[0])
+    raise LMError(
+        f"{proc.args[0]} exited with code {proc.returncode}, please see {log_path} for details"
+    )
+
 
 class LmTrainer:
     """
@@ -67,18 +142,32 @@ class LmTrainer:
         self.models_temp_dir = os.path.join(self.temp_directory, "models")
         self.log_directory = os.path.join(self.temp_directory, "logs")
         self.log_file = os.path.join(self.log_directory, "train_lm.log")
-        os.makedirs(self.log_directory, exist_ok=True)
+        base_path = os.path.join(self.temp_directory, self.name)
+        self.training_path = os.path.join(self.temp_directory, "training.txt")
+        self.sym_path = base_path + ".sym"
+        self.far_path = base_path + ".far"
+        self.mod_path = base_path + ".mod"
+        self.small_mod_path = base_path + "_small.mod"
+        self.med_mod_path = base_path + "_med.mod"
+        self.large_arpa_path = base_path + ".arpa"
+        self.small_arpa_path = base_path + "_small.arpa"
+        self.med_arpa_path = base_path + "_med.arpa"
+        self.supplemental_mod_path = os.path.join(self.temp_directory, "extra.mod")
+        self.merged_mod_path = os.path.join(self.temp_directory, "merged.mod")
+        if not os.path.isdir(self.log_directory):
+            os.makedirs(self.log_directory, exist_ok=True)
         if logger is None:
             self.logger = logging.getLogger("train_lm")
             self.logger.setLevel(logging.INFO)
             handler = logging.FileHandler(self.log_file, "w", "utf-8")
-            handler.setFormatter = logging.Formatter("%(name)s %(message)s")
+            handler.setFormatter(logging.Formatter("%(name)s %(message)s"))
             self.logger.addHandler(handler)
         else:
             self.logger = logger
         self.source = source
         self.dictionary = dictionary
         self.output_model_path = output_model_path
+        self.output_basename, _ = os.path.splitext(output_model_path)
         self.config = config
         self.supplemental_model_path = supplemental_model_path
         self.source_model_weight = 1
@@ -100,178 +189,227 @@ class LmTrainer:
     def evaluate(self) -> None:
         """
         Run an evaluation over the training data to generate perplexity score
+
+        Raises
+        ------
+        :class:`~montreal_forced_aligner.exceptions.LMError`
+            If any of the perplexity calculations fail
         """
         log_path = os.path.join(self.log_directory, "evaluate.log")
-        mod_path = os.path.join(self.temp_directory, self.name + ".mod")
-        far_path = os.path.join(self.temp_directory, self.name + ".far")
-        small_mod_path = mod_path.replace(".mod", "_small.mod")
-        med_mod_path = mod_path.replace(".mod", "_med.mod")
+        model_paths = [("large", self.mod_path)]
+        if self.config.prune:
+            # Medium and small models only exist when pruning
+            model_paths.append(("medium", self.med_mod_path))
+            model_paths.append(("small", self.small_mod_path))
         with open(log_path, "w", encoding="utf8") as log_file:
-            perplexity_proc = subprocess.Popen(
-                ["ngramperplexity", '--OOV_symbol="<unk>"', mod_path, far_path],
-                stdout=subprocess.PIPE,
-                stderr=log_file,
-                text=True,
-            )
-            stdout, stderr = perplexity_proc.communicate()
-            num_sentences = None
-            num_words = None
-            num_oovs = None
-            perplexity = None
-            for line in stdout.splitlines():
-                m = re.search(r"(\d+) sentences", line)
-                if m:
-                    num_sentences = m.group(0)
-                m = re.search(r"(\d+) words", line)
-                if m:
-                    num_words = m.group(0)
-                m = re.search(r"(\d+) OOVs", line)
-                if m:
-                    num_oovs = m.group(0)
-                m = re.search(r"perplexity = ([\d.]+)", line)
-                if m:
-                    perplexity = m.group(0)
-
-            self.logger.info(f"{num_sentences} sentences, {num_words} words, {num_oovs} oovs")
-            self.logger.info(f"Perplexity of large model: {perplexity}")
-
-            perplexity_proc = subprocess.Popen(
-                ["ngramperplexity", '--OOV_symbol="<unk>"', med_mod_path, far_path],
-                stdout=subprocess.PIPE,
-                stderr=log_file,
-                text=True,
-            )
-            stdout, stderr = perplexity_proc.communicate()
-
-            perplexity = None
-            for line in stdout.splitlines():
-                m = re.search(r"perplexity = ([\d.]+)", line)
-                if m:
-                    perplexity = m.group(0)
-            self.logger.info(f"Perplexity of medium model: {perplexity}")
-            perplexity_proc = subprocess.Popen(
-                ["ngramperplexity", '--OOV_symbol="<unk>"', small_mod_path, far_path],
-                stdout=subprocess.PIPE,
-                stderr=log_file,
-                text=True,
-            )
-            stdout, stderr = perplexity_proc.communicate()
-
-            perplexity = None
-            for line in stdout.splitlines():
-                m = re.search(r"perplexity = ([\d.]+)", line)
-                if m:
-                    perplexity = m.group(0)
-            self.logger.info(f"Perplexity of small model: {perplexity}")
+
+            def run_perplexity(path: str) -> subprocess.Popen:
+                return subprocess.Popen(
+                    ["ngramperplexity", '--OOV_symbol="<unk>"', path, self.far_path],
+                    stdout=subprocess.PIPE,
+                    stderr=log_file,
+                    text=True,
+                    bufsize=1,
+                )
+
+            procs = []
+            if self.config.use_mp:
+                # The models are independent, so evaluate them concurrently
+                procs = [run_perplexity(path) for _, path in model_paths]
+            try:
+                for i, (model_name, path) in enumerate(model_paths):
+                    if not self.config.use_mp:
+                        procs.append(run_perplexity(path))
+                    proc = procs[i]
+                    num_sentences = None
+                    num_words = None
+                    num_oovs = None
+                    perplexity = None
+                    for line in proc.stdout:
+                        m = _RE_SENTENCES.search(line)
+                        if m:
+                            # Sentence, word and OOV counts are reported on the same line
+                            num_sentences = m.group(0)
+                            m = _RE_WORDS.search(line)
+                            if m:
+                                num_words = m.group(0)
+                            m = _RE_OOVS.search(line)
+                            if m:
+                                num_oovs = m.group(0)
+                            continue
+                        m = _RE_PPL.search(line)
+                        if m:
+                            perplexity = m.group(0)
+                            if i > 0 or num_sentences is not None:
+                                break
+                    proc.communicate()
+                    if i == 0:
+                        self.logger.info(
+                            f"{num_sentences} sentences, {num_words} words, {num_oovs} oovs"
+                        )
+                    self.logger.info(f"Perplexity of {model_name} model: {perplexity}")
+            finally:
+                # Reap every process, even if reading one of their outputs failed
+                for proc in procs:
+                    proc.stdout.close()
+                    proc.wait()
+        _wait_for_processes(procs, log_path)
 
     def train(self) -> None:
         """
         Train a language model
+
+        Raises
+        ------
+        :class:`~montreal_forced_aligner.exceptions.LMError`
+            If any of the OpenGrm binaries fail
         """
-        mod_path = os.path.join(self.temp_directory, f"{self.name}.mod")
-        large_model_path = os.path.join(self.temp_directory, f"{self.name}.arpa")
-        small_output_path = large_model_path.replace(".arpa", "_small.arpa")
-        med_output_path = large_model_path.replace(".arpa", "_med.arpa")
-        if isinstance(self.source, Corpus):
-            self.logger.info("Beginning training large ngram model...")
-            sym_path = os.path.join(self.temp_directory, f"{self.name}.sym")
-            far_path = os.path.join(self.temp_directory, f"{self.name}.far")
-            cnts_path = os.path.join(self.temp_directory, f"{self.name}.cnts")
-            training_path = os.path.join(self.temp_directory, "training.txt")
-
-            with open(training_path, "w", encoding="utf8") as f:
-                for text in self.source.normalized_text_iter(
-                    self.dictionary, self.config.count_threshold
-                ):
-                    f.write(f"{text}\n")
-
-            if self.dictionary is not None:
-                self.dictionary.save_oovs_found(self.temp_directory)
-
-            subprocess.call(["ngramsymbols", '--OOV_symbol="<unk>"', training_path, sym_path])
-            subprocess.call(
-                [
-                    "farcompilestrings",
-                    "--fst_type=compact",
-                    '--unknown_symbol="<unk>"',
-                    "--symbols=" + sym_path,
-                    "--keep_symbols",
-                    training_path,
-                    far_path,
-                ]
-            )
-            subprocess.call(["ngramcount", f"--order={self.config.order}", far_path, cnts_path])
-            subprocess.call(["ngrammake", f"--method={self.config.method}", cnts_path, mod_path])
-            self.logger.info("Done!")
-        else:
-            self.logger.info("Parsing large ngram model...")
-            temp_text_path = os.path.join(self.temp_directory, "input.arpa")
-            with open(self.source, "r", encoding="utf8") as inf, open(
-                temp_text_path, "w", encoding="utf8"
-            ) as outf:
-                for line in inf:
-                    outf.write(line.lower())
-            subprocess.call(["ngramread", "--ARPA", temp_text_path, mod_path])
-            os.remove(temp_text_path)
-        if self.supplemental_model_path:
-            self.logger.info("Parsing supplemental ngram model...")
-            supplemental_path = os.path.join(self.temp_directory, "extra.mod")
-            merged_path = os.path.join(self.temp_directory, "merged.mod")
-            subprocess.call(
-                ["ngramread", "--ARPA", self.supplemental_model_path, supplemental_path]
-            )
-            self.logger.info("Merging both ngram models to create final large model...")
-            subprocess.call(
-                [
-                    "ngrammerge",
-                    "--normalize",
-                    f"--alpha={self.source_model_weight}",
-                    f"--beta={self.supplemental_model_weight}",
-                    mod_path,
-                    supplemental_path,
-                    merged_path,
-                ]
-            )
-            mod_path = merged_path
+        mod_path = self.mod_path
+        log_path = os.path.join(self.log_directory, "train.log")
+        with open(log_path, "w", encoding="utf8") as log_file:
 
-        subprocess.call(["ngramprint", "--ARPA", mod_path, large_model_path])
+            def run(command: List[str]) -> None:
+                try:
+                    subprocess.run(command, stdout=log_file, stderr=log_file, check=True)
+                except subprocess.CalledProcessError as e:
+                    raise LMError(
+                        f"{command[0]} exited with code {e.returncode}, "
+                        f"please see {log_path} for details"
+                    )
 
-        self.logger.info("Large ngam model created!")
-        directory, filename = os.path.split(self.output_model_path)
-        basename, _ = os.path.splitext(filename)
+            if isinstance(self.source, Corpus):
+                self.logger.info("Beginning training large ngram model...")
+                with open(self.training_path, "w", encoding="utf8", buffering=1 << 20) as f:
+                    batch = []
+                    for text in self.source.normalized_text_iter(
+                        self.dictionary, self.config.count_threshold
+                    ):
+                        batch.append(text)
+                        if len(batch) >= 8192:
+                            f.write("\n".join(batch))
+                            f.write("\n")
+                            batch.clear()
+                    if batch:
+                        f.write("\n".join(batch))
+                        f.write("\n")
 
-        if self.config.prune:
-            self.logger.info("Pruning large ngram model to medium and small versions...")
-            small_mod_path = mod_path.replace(".mod", "_small.mod")
-            med_mod_path = mod_path.replace(".mod", "_med.mod")
-            subprocess.call(
-                [
-                    "ngramshrink",
-                    "--method=relative_entropy",
-                    f"--theta={self.config.prune_thresh_small}",
-                    mod_path,
-                    small_mod_path,
+                if self.dictionary is not None:
+                    self.dictionary.save_oovs_found(self.temp_directory)
+
+                run(["ngramsymbols", '--OOV_symbol="<unk>"', self.training_path, self.sym_path])
+                run(
+                    [
+                        "farcompilestrings",
+                        "--fst_type=compact",
+                        '--unknown_symbol="<unk>"',
+                        "--symbols=" + self.sym_path,
+                        "--keep_symbols",
+                        self.training_path,
+                        self.far_path,
+                    ]
+                )
+                if not self.debug:
+                    os.remove(self.training_path)
+                # Stream counts straight into ngrammake rather than round-tripping them through disk
+                count_proc = subprocess.Popen(
+                    ["ngramcount", f"--order={self.config.order}", self.far_path],
+                    stdout=subprocess.PIPE,
+                    stderr=log_file,
+                )
+                make_proc = subprocess.Popen(
+                    ["ngrammake", f"--method={self.config.method}", "-", mod_path],
+                    stdin=count_proc.stdout,
+                    stdout=log_file,
+                    stderr=log_file,
+                )
+                count_proc.stdout.close()
+                _wait_for_processes([count_proc, make_proc], log_path)
+                self.logger.info("Done!")
+            else:
+                self.logger.info("Parsing large ngram model...")
+                read_proc = subprocess.Popen(
+                    ["ngramread", "--ARPA", "-", mod_path],
+                    stdin=subprocess.PIPE,
+                    stdout=log_file,
+                    stderr=log_file,
+                )
+                try:
+                    with open(self.source, "rb") as inf:
+                        _lowercase_arpa(inf, read_proc.stdin)
+                    read_proc.stdin.close()
+                except BrokenPipeError:
+                    pass  # ngramread exited early, its exit status is checked below
+                _wait_for_processes([read_proc], log_path)
+            if self.supplemental_model_path:
+                self.logger.info("Parsing supplemental ngram model...")
+                run(
+                    [
+                        "ngramread",
+                        "--ARPA",
+                        self.supplemental_model_path,
+                        self.supplemental_mod_path,
+                    ]
+                )
+                self.logger.info("Merging both ngram models to create final large model...")
+                run(
+                    [
+                        "ngrammerge",
+                        "--normalize",
+                        f"--alpha={self.source_model_weight}",
+                        f"--beta={self.supplemental_model_weight}",
+                        mod_path,
+                        self.supplemental_mod_path,
+                        self.merged_mod_path,
+                    ]
+                )
+                mod_path = self.merged_mod_path
+
+            run(["ngramprint", "--ARPA", mod_path, self.large_arpa_path])
+
+            self.logger.info("Large ngam model created!")
+
+            if self.config.prune:
+                self.logger.info("Pruning large ngram model to medium and small versions...")
+                shrink_commands = [
+                    [
+                        "ngramshrink",
+                        "--method=relative_entropy",
+                        f"--theta={self.config.prune_thresh_small}",
+                        mod_path,
+                        self.small_mod_path,
+                    ],
+                    [
+                        "ngramshrink",
+                        "--method=relative_entropy",
+                        f"--theta={self.config.prune_thresh_medium}",
+                        mod_path,
+                        self.med_mod_path,
+                    ],
                 ]
-            )
-            subprocess.call(
-                [
-                    "ngramshrink",
-                    "--method=relative_entropy",
-                    f"--theta={self.config.prune_thresh_medium}",
-                    mod_path,
-                    med_mod_path,
+                print_commands = [
+                    ["ngramprint", "--ARPA", self.small_mod_path, self.small_arpa_path],
+                    ["ngramprint", "--ARPA", self.med_mod_path, self.med_arpa_path],
                 ]
-            )
-            subprocess.call(["ngramprint", "--ARPA", small_mod_path, small_output_path])
-            subprocess.call(["ngramprint", "--ARPA", med_mod_path, med_output_path])
-            self.logger.info("Done!")
-        self.evaluate()
-        model = LanguageModel.empty(basename, root_directory=self.models_temp_dir)
+                for commands in (shrink_commands, print_commands):
+                    if self.config.use_mp:
+                        # Small and medium models are pruned and printed independently
+                        procs = [
+                            subprocess.Popen(command, stdout=log_file, stderr=log_file)
+                            for command in commands
+                        ]
+                        _wait_for_processes(procs, log_path)
+                    else:
+                        for command in commands:
+                            run(command)
+                self.logger.info("Done!")
+        if isinstance(self.source, Corpus):
+            # Perplexity is calculated over the training FAR, which only exists for corpus sources
+            self.evaluate()
+        model = LanguageModel.empty(self.name, root_directory=self.models_temp_dir)
         model.add_meta_file(self)
-        model.add_arpa_file(large_model_path)
+        model.add_arpa_file(self.large_arpa_path)
         if self.config.prune:
-            model.add_arpa_file(med_output_path)
-            model.add_arpa_file(small_output_path)
-        basename, _ = os.path.splitext(self.output_model_path)
-        model.dump(basename)
+            model.add_arpa_file(self.med_arpa_path)
+            model.add_arpa_file(self.small_arpa_path)
+        model.dump(self.output_basename)
         # model.clean_up()
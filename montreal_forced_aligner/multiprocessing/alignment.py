@@ -23,6 +23,7 @@ from ..textgrid import (
     parse_from_word,
     parse_from_word_no_cleanup,
     process_ctm_line,
+    strip_phone_positions,
 )
 from ..utils import thirdparty_binary
 from .helper import run_mp, run_non_mp
@@ -1255,7 +1256,10 @@ class PhoneCtmProcessWorker(mp.Process):
         def process_current_utt(cur_utt: Utterance, current_labels: CtmType) -> None:
             """Process current stack of intervals"""
             actual_labels = parse_from_phone(
-                current_labels, self.reversed_phone_mappings[dict_name], self.positions[dict_name]
+                current_labels,
+                self.reversed_phone_mappings[dict_name],
+                self.positions[dict_name],
+                phone_labels,
             )
             current_file_data[cur_utt.name] = actual_labels
 
@@ -1265,6 +1269,9 @@ class PhoneCtmProcessWorker(mp.Process):
 
         try:
             for dict_name in self.dictionaries:
+                phone_labels = strip_phone_positions(
+                    self.reversed_phone_mappings[dict_name], self.positions[dict_name]
+                )
                 with open(self.ctm_paths[dict_name], "r") as word_file:
                     for line in word_file:
                         line = line.strip()
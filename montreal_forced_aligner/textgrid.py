@@ -1,23 +1,40 @@
 """Classes and functions for working with TextGrids in MFA"""
 from __future__ import annotations
 
+import bisect
+import functools
+import itertools
+import operator
 import os
 import re
 import sys
 import traceback
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
-
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 from praatio import textgrid as tgio
 from praatio.utilities.textgrid_io import Interval
 
 if TYPE_CHECKING:
     from .aligner.base import BaseAligner
-    from .corpus.classes import DictionaryData, File, Speaker
+    from .corpus.classes import DictionaryData, File, Speaker, Utterance
     from .dictionary import (
         DictionaryEntryType,
         IpaType,
         MappingType,
+        PrefixTableType,
         PunctuationType,
         ReversedMappingType,
     )
@@ -29,9 +46,11 @@ if TYPE_CHECKING:
 __all__ = [
     "CtmInterval",
     "process_ctm_line",
+    "parse_ctm_file",
     "map_to_original_pronunciation",
     "parse_from_word",
     "parse_from_phone",
+    "strip_phone_positions",
     "parse_from_word_no_cleanup",
     "generate_tiers",
     "export_textgrid",
@@ -60,6 +79,8 @@ class CtmInterval:
         Utterance ID that the interval belongs to
     """
 
+    __slots__ = ("begin", "end", "label", "utterance")
+
     begin: float
     end: float
     label: str
@@ -113,6 +134,79 @@ def process_ctm_line(line: str) -> CtmInterval:
     return CtmInterval(begin, end, label, utt)
 
 
+@functools.lru_cache(maxsize=None)
+def _marker_pattern(markers: str) -> Pattern:
+    """
+    Compile a pattern matching any one of the given marker characters
+
+    Parameters
+    ----------
+    markers: str
+        Clitic or compound markers
+
+    Returns
+    -------
+    Pattern
+        Compiled character class pattern
+    """
+    return re.compile(f"[{re.escape(markers)}]")
+
+
+@functools.lru_cache(maxsize=None)
+def _marker_set(markers: str) -> FrozenSet[str]:
+    """
+    Get the set of marker characters for fast membership tests
+
+    Parameters
+    ----------
+    markers: str
+        Clitic or compound markers
+
+    Returns
+    -------
+    FrozenSet[str]
+        Set of marker characters
+    """
+    return frozenset(markers)
+
+
+def parse_ctm_file(path: str) -> List[CtmInterval]:
+    """
+    Parse all lines of a CTM file into CtmIntervals
+
+    When the file has five fields for every non-blank line, it is split into columns and the
+    time columns are converted and rounded as arrays, rather than parsing each line separately
+
+    Parameters
+    ----------
+    path: str
+        Path to CTM file
+
+    Returns
+    -------
+    List[CtmInterval]
+        Intervals in the order they appear in the file
+    """
+    with open(path, "r", encoding="utf8") as f:
+        data = f.read()
+    lines = data.splitlines()
+    tokens = data.split()
+    try:
+        if len(tokens) != 5 * (len(lines) - lines.count("")):
+            raise ValueError("CTM lines do not all have five fields")
+        begins = np.round(np.array(tokens[2::5], dtype=float), 4)
+        ends = np.round(begins + np.array(tokens[3::5], dtype=float), 4)
+    except ValueError:
+        # Irregular lines, fall back to parsing line by line
+        return [process_ctm_line(line.strip()) for line in lines if line.strip()]
+    return [
+        CtmInterval(begin, end, label, utt)
+        for begin, end, label, utt in zip(
+            begins.tolist(), ends.tolist(), tokens[4::5], tokens[0::5]
+        )
+    ]
+
+
 def split_clitics(
     item: str,
     words_mapping: MappingType,
@@ -143,12 +237,16 @@ def split_clitics(
     """
     if item in words_mapping:
         return [item]
-    if any(x in item for x in compound_markers):
-        s = re.split(rf"[{compound_markers}]", item)
-        if any(x in item for x in clitic_markers):
+    clitic_marker_set = _marker_set(clitic_markers)
+    if not _marker_set(compound_markers).isdisjoint(item):
+        if len(compound_markers) == 1:
+            s = item.split(compound_markers)
+        else:
+            s = _marker_pattern(compound_markers).split(item)
+        if not clitic_marker_set.isdisjoint(item):
             new_s = []
             for seg in s:
-                if any(x in seg for x in clitic_markers):
+                if not clitic_marker_set.isdisjoint(seg):
                     new_s.extend(
                         split_clitics(
                             seg, words_mapping, clitic_set, clitic_markers, compound_markers
@@ -158,9 +256,13 @@ def split_clitics(
                     new_s.append(seg)
             s = new_s
         return s
-    if any(x in item and not item.endswith(x) and not item.startswith(x) for x in clitic_markers):
-        initial, final = re.split(rf"[{clitic_markers}]", item, maxsplit=1)
-        if any(x in final for x in clitic_markers):
+    # Only split on clitic markers that don't start or end the word
+    if item and not (clitic_marker_set - {item[0], item[-1]}).isdisjoint(item):
+        if len(clitic_markers) == 1:
+            initial, final = item.split(clitic_markers, 1)
+        else:
+            initial, final = _marker_pattern(clitic_markers).split(item, maxsplit=1)
+        if not clitic_marker_set.isdisjoint(final):
             final = split_clitics(
                 final, words_mapping, clitic_set, clitic_markers, compound_markers
             )
@@ -182,6 +284,7 @@ def _lookup(
     clitic_set: Set[str],
     clitic_markers: PunctuationType,
     compound_markers: PunctuationType,
+    cache: Optional[Dict[str, Tuple[str, ...]]] = None,
 ) -> List[str]:
     """
     Look up a word and return the list of sub words if necessary
@@ -191,25 +294,39 @@ def _lookup(
     ----------
     item: str
         Word to look up
+    cache: Dict[str, Tuple[str, ...]], optional
+        Cache of previous look ups for the dictionary data the other arguments come from
 
     Returns
     -------
     List[str]
         List of subwords that are in the dictionary
     """
-    from montreal_forced_aligner.dictionary import sanitize
-
     if item in words_mapping:
         return [item]
+    if cache is not None:
+        cached = cache.get(item)
+        if cached is not None:
+            return list(cached)
+    from montreal_forced_aligner.dictionary import sanitize
+
     sanitized = sanitize(item, punctuation, clitic_markers)
     if sanitized in words_mapping:
-        return [sanitized]
-    split = split_clitics(sanitized, words_mapping, clitic_set, clitic_markers, compound_markers)
-    oov_count = sum(1 for x in split if x not in words_mapping)
+        result = [sanitized]
+    else:
+        split = split_clitics(
+            sanitized, words_mapping, clitic_set, clitic_markers, compound_markers
+        )
+        oov_count = sum(1 for x in split if x not in words_mapping)
 
-    if oov_count < len(split):  # Only returned split item if it gains us any transcribed speech
-        return split
-    return [sanitized]
+        # Only returned split item if it gains us any transcribed speech
+        if oov_count < len(split):
+            result = split
+        else:
+            result = [sanitized]
+    if cache is not None:
+        cache[item] = tuple(result)
+    return result
 
 
 def to_int(
@@ -220,6 +337,8 @@ def to_int(
     clitic_markers: PunctuationType,
     compound_markers: PunctuationType,
     oov_int: int,
+    lookup_cache: Optional[Dict[str, Tuple[str, ...]]] = None,
+    int_cache: Optional[Dict[str, Tuple[int, ...]]] = None,
 ) -> List[int]:
     """
     Convert a given word into integer IDs
@@ -228,6 +347,10 @@ def to_int(
     ----------
     item: str
         Word to look up
+    lookup_cache: Dict[str, Tuple[str, ...]], optional
+        Cache of previous look ups for the dictionary data the other arguments come from
+    int_cache: Dict[str, Tuple[int, ...]], optional
+        Cache of previous conversions for the dictionary data the other arguments come from
 
     Returns
     -------
@@ -236,20 +359,70 @@ def to_int(
     """
     if item == "":
         return []
+    if int_cache is not None:
+        cached = int_cache.get(item)
+        if cached is not None:
+            return list(cached)
     sanitized = _lookup(
-        item, words_mapping, punctuation, clitic_set, clitic_markers, compound_markers
+        item,
+        words_mapping,
+        punctuation,
+        clitic_set,
+        clitic_markers,
+        compound_markers,
+        lookup_cache,
     )
     text_int = []
-    for item in sanitized:
-        if not item:
+    for subword in sanitized:
+        if not subword:
             continue
-        if item not in words_mapping:
+        if subword not in words_mapping:
             text_int.append(oov_int)
         else:
-            text_int.append(words_mapping[item])
+            text_int.append(words_mapping[subword])
+    if int_cache is not None:
+        int_cache[item] = tuple(text_int)
     return text_int
 
 
+def _merge_subword_spans(
+    label_ints: List[int], begins: List[float], ends: List[float], word_ints: List[List[int]]
+) -> List[Tuple[float, float]]:
+    """
+    Walk aligned subword IDs and find the span of each original word
+
+    Parameters
+    ----------
+    label_ints: List[int]
+        Word IDs of the aligned CTM intervals
+    begins: List[float]
+        Begin times of the aligned CTM intervals
+    ends: List[float]
+        End times of the aligned CTM intervals
+    word_ints: List[List[int]]
+        Subword IDs for each word of the original text
+
+    Returns
+    -------
+    List[Tuple[float, float]]
+        Begin and end time for each word of the original text
+    """
+    spans = []
+    cur_ind = 0
+    for ints in word_ints:
+        b = 1000000
+        e = -1
+        for i in ints:
+            if i == label_ints[cur_ind]:
+                if begins[cur_ind] < b:
+                    b = begins[cur_ind]
+                if ends[cur_ind] > e:
+                    e = ends[cur_ind]
+            cur_ind += 1
+        spans.append((b, e))
+    return spans
+
+
 def parse_from_word(
     ctm_labels: List[CtmInterval], text: List[str], dictionary_data: DictionaryData
 ) -> List[CtmInterval]:
@@ -270,34 +443,36 @@ def parse_from_word(
     List[CtmInterval]
         Correct intervals with subwords merged back into their original text
     """
-    cur_ind = 0
-    actual_labels = []
-    utterance = None
     words_mapping = dictionary_data.words_mapping
     punctuation = dictionary_data.punctuation
     clitic_set = dictionary_data.clitic_set
     clitic_markers = dictionary_data.clitic_markers
     compound_markers = dictionary_data.compound_markers
     oov_int = dictionary_data.oov_int
-    for word in text:
-        ints = to_int(
-            word, words_mapping, punctuation, clitic_set, clitic_markers, compound_markers, oov_int
+    lookup_cache = dictionary_data.lookup_cache
+    int_cache = dictionary_data.int_cache
+    word_ints = [
+        to_int(
+            word,
+            words_mapping,
+            punctuation,
+            clitic_set,
+            clitic_markers,
+            compound_markers,
+            oov_int,
+            lookup_cache,
+            int_cache,
         )
-        b = 1000000
-        e = -1
-        for i in ints:
-            cur = ctm_labels[cur_ind]
-            if utterance is None:
-                utterance = cur.utterance
-            if i == int(cur.label):
-                if cur.begin < b:
-                    b = cur.begin
-                if cur.end > e:
-                    e = cur.end
-            cur_ind += 1
-        lab = CtmInterval(b, e, word, utterance)
-        actual_labels.append(lab)
-    return actual_labels
+        for word in text
+    ]
+    spans = _merge_subword_spans(
+        [int(x.label) for x in ctm_labels],
+        [x.begin for x in ctm_labels],
+        [x.end for x in ctm_labels],
+        word_ints,
+    )
+    utterance = ctm_labels[0].utterance if ctm_labels else None
+    return [CtmInterval(b, e, word, utterance) for word, (b, e) in zip(text, spans)]
 
 
 def parse_from_word_no_cleanup(
@@ -325,10 +500,38 @@ def parse_from_word_no_cleanup(
     return ctm_labels
 
 
+def strip_phone_positions(
+    reversed_phone_mapping: ReversedMappingType, positions: List[str]
+) -> Dict[int, str]:
+    """
+    Get the phone labels for a phone mapping with word position suffixes removed
+
+    Parameters
+    ----------
+    reversed_phone_mapping: Dict[int, str]
+        Mapping to convert phone IDs to phone labels
+    positions: List[str]
+        List of word positions to account for
+
+    Returns
+    -------
+    Dict[int, str]
+        Mapping of phone IDs to phone labels without positions
+    """
+    labels = {}
+    for phone_id, label in reversed_phone_mapping.items():
+        for p in positions:
+            if label.endswith(p):
+                label = label[: -1 * len(p)]
+        labels[phone_id] = label
+    return labels
+
+
 def parse_from_phone(
     ctm_labels: List[CtmInterval],
     reversed_phone_mapping: ReversedMappingType,
     positions: List[str],
+    phone_labels: Optional[Dict[int, str]] = None,
 ) -> List[CtmInterval]:
     """
     Parse CtmIntervals to original phone transcriptions
@@ -341,23 +544,94 @@ def parse_from_phone(
         Mapping to convert phone IDs to phone labels
     positions: List[str]
         List of word positions to account for
+    phone_labels: Dict[int, str], optional
+        Phone labels from :func:`strip_phone_positions`, generated from the mapping and
+        positions if not specified
 
     Returns
     -------
     List[CtmInterval]
         Parsed intervals with phone labels rather than IDs
     """
+    if phone_labels is None:
+        phone_labels = strip_phone_positions(reversed_phone_mapping, positions)
     for ctm_interval in ctm_labels:
-        label = reversed_phone_mapping[int(ctm_interval.label)]
-        for p in positions:
-            if label.endswith(p):
-                label = label[: -1 * len(p)]
-        ctm_interval.label = label
+        ctm_interval.label = phone_labels[int(ctm_interval.label)]
     return ctm_labels
 
 
+def _build_prefix_table(pronunciations: DictionaryEntryType) -> PrefixTableType:
+    """
+    Build a look up table from pronunciation to a word's entries with that pronunciation
+
+    Parameters
+    ----------
+    pronunciations: DictionaryEntryType
+        Pronunciation entries for a word
+
+    Returns
+    -------
+    Dict[Tuple[str, ...], List[Tuple[int, Dict[str, Any]]]]
+        Entries for each pronunciation along with their index in the original list
+    List[int]
+        Distinct pronunciation lengths
+    """
+    table = {}
+    for i, p in enumerate(pronunciations):
+        table.setdefault(p["pronunciation"], []).append((i, p))
+    return table, list({len(x) for x in table})
+
+
+def _get_prefix_table(dictionary_data: DictionaryData, word: str) -> PrefixTableType:
+    """
+    Get the pronunciation look up table for a word, building it the first time the
+    word is seen for the dictionary data
+
+    Parameters
+    ----------
+    dictionary_data: DictionaryData
+        Dictionary data containing the word
+    word: str
+        Word to get the table for
+
+    Returns
+    -------
+    PrefixTableType
+        Pronunciation look up table and distinct pronunciation lengths
+    """
+    try:
+        return dictionary_data.prefix_tables[word]
+    except KeyError:
+        table = _build_prefix_table(dictionary_data.words[word])
+        dictionary_data.prefix_tables[word] = table
+        return table
+
+
+@functools.lru_cache(maxsize=None)
+def _diacritic_table(strip_diacritics: Tuple[str, ...]) -> Optional[Dict[int, None]]:
+    """
+    Build a translation table that deletes the given diacritics
+
+    Parameters
+    ----------
+    strip_diacritics: Tuple[str, ...]
+        Diacritics to strip
+
+    Returns
+    -------
+    Dict[int, None], optional
+        Table for :meth:`str.translate`, or None if any diacritic is longer than one character
+    """
+    if not all(len(x) == 1 for x in strip_diacritics):
+        return None
+    return str.maketrans("", "", "".join(strip_diacritics))
+
+
 def map_to_original_pronunciation(
-    phones: CtmType, subpronunciations: List[DictionaryEntryType], strip_diacritics: IpaType
+    phones: CtmType,
+    subpronunciations: List[DictionaryEntryType],
+    strip_diacritics: IpaType,
+    prefix_tables: Optional[List[PrefixTableType]] = None,
 ) -> CtmType:
     """
     Convert phone transcriptions from multilingual IPA mode to their original IPA transcription
@@ -370,36 +644,38 @@ def map_to_original_pronunciation(
         Pronunciations of each sub word to reconstruct the transcriptions
     strip_diacritics: List[str]
         List of diacritics that were stripped out of the original IPA transcription
+    prefix_tables: List[PrefixTableType], optional
+        Pronunciation look up tables for each sub word, built from the pronunciations if
+        not specified
 
     Returns
     -------
     List[CtmInterval]
         Intervals with their original IPA pronunciation rather than the internal simplified form
     """
+    if prefix_tables is None:
+        prefix_tables = [_build_prefix_table(x) for x in subpronunciations]
     transcription = tuple(x.label for x in phones)
+    strip_table = _diacritic_table(tuple(strip_diacritics))
     new_phones = []
     mapping_ind = 0
     transcription_ind = 0
-    for pronunciations in subpronunciations:
+    for pronunciations, (table, lengths) in zip(subpronunciations, prefix_tables):
         pron = None
         if mapping_ind >= len(phones):
             break
-        for p in pronunciations:
-            if (
-                "original_pronunciation" in p
-                and transcription == p["pronunciation"] == p["original_pronunciation"]
-            ) or (transcription == p["pronunciation"] and "original_pronunciation" not in p):
-                new_phones.extend(phones)
-                mapping_ind += len(phones)
-                break
-            if (
-                p["pronunciation"]
-                == transcription[transcription_ind : transcription_ind + len(p["pronunciation"])]
-                and pron is None
-            ):
-                pron = p
-        if mapping_ind >= len(phones):
+        if any(
+            "original_pronunciation" not in p or transcription == p["original_pronunciation"]
+            for _, p in table.get(transcription, ())
+        ):
+            new_phones.extend(phones)
             break
+        # Use the first listed pronunciation that is a prefix of the remaining transcription
+        pron_index = len(pronunciations)
+        for length in lengths:
+            candidates = table.get(transcription[transcription_ind : transcription_ind + length])
+            if candidates and candidates[0][0] < pron_index:
+                pron_index, pron = candidates[0]
         if not pron:
             new_phones.extend(phones)
             mapping_ind += len(phones)
@@ -416,10 +692,13 @@ def map_to_original_pronunciation(
             if pi == phones[mapping_ind].label:
                 new_phones.append(phones[mapping_ind])
             else:
-                modded_phone = pi
                 new_p = phones[mapping_ind].label
-                for diacritic in strip_diacritics:
-                    modded_phone = modded_phone.replace(diacritic, "")
+                if strip_table is not None:
+                    modded_phone = pi.translate(strip_table)
+                else:
+                    modded_phone = pi
+                    for diacritic in strip_diacritics:
+                        modded_phone = modded_phone.replace(diacritic, "")
                 if modded_phone == new_p:
                     phones[mapping_ind].label = pi
                     new_phones.append(phones[mapping_ind])
@@ -449,7 +728,7 @@ def ctms_to_textgrids_non_mp(aligner: AlignerType) -> None:
         Aligner that generated the CTM files
     """
 
-    def process_current_word_labels():
+    def process_current_word_labels(cur_utt: Utterance, current_labels: CtmType):
         """Process the current stack of word labels"""
         speaker = cur_utt.speaker
 
@@ -462,87 +741,51 @@ def ctms_to_textgrids_non_mp(aligner: AlignerType) -> None:
             )
         cur_utt.word_labels = actual_labels
 
-    def process_current_phone_labels():
-        """Process the current stack of phone labels"""
-        speaker = cur_utt.speaker
-
-        cur_utt.phone_labels = parse_from_phone(
-            current_labels, speaker.dictionary.reversed_phone_mapping, speaker.dictionary.positions
-        )
+    def utterance_groups(ctm_path: str) -> Iterator[Tuple[Utterance, CtmType]]:
+        """Group consecutive intervals of a CTM file by utterance, shifted to file times"""
+        for utt_name, group in itertools.groupby(
+            parse_ctm_file(ctm_path), key=operator.attrgetter("utterance")
+        ):
+            utt = aligner.corpus.utterances[utt_name]
+            current_labels = list(group)
+            if utt.is_segment:
+                for ctm_interval in current_labels:
+                    ctm_interval.shift_times(utt.begin)
+            yield utt, current_labels
 
     export_errors = {}
+    files = {}
     for j in aligner.corpus.jobs:
 
         word_arguments = j.cleanup_word_ctm_arguments(aligner)
         phone_arguments = j.phone_ctm_arguments(aligner)
         aligner.logger.debug(f"Parsing ctms for job {j.name}...")
-        cur_utt = None
-        current_labels = []
         for dict_name in word_arguments.dictionaries:
-            with open(word_arguments.ctm_paths[dict_name], "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line == "":
-                        continue
-                    ctm_interval = process_ctm_line(line)
-                    utt = aligner.corpus.utterances[ctm_interval.utterance]
-                    if cur_utt is None:
-                        cur_utt = utt
-                    if utt.is_segment:
-                        utt_begin = utt.begin
-                    else:
-                        utt_begin = 0
-                    if utt != cur_utt:
-                        process_current_word_labels()
-                        cur_utt = utt
-                        current_labels = []
-
-                    ctm_interval.shift_times(utt_begin)
-                    current_labels.append(ctm_interval)
-            if current_labels:
-                process_current_word_labels()
-        cur_utt = None
-        current_labels = []
+            for utt, current_labels in utterance_groups(word_arguments.ctm_paths[dict_name]):
+                process_current_word_labels(utt, current_labels)
         for dict_name in phone_arguments.dictionaries:
-            with open(phone_arguments.ctm_paths[dict_name], "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line == "":
-                        continue
-                    ctm_interval = process_ctm_line(line)
-                    utt = aligner.corpus.utterances[ctm_interval.utterance]
-                    if cur_utt is None:
-                        cur_utt = utt
-                    if utt.is_segment:
-                        utt_begin = utt.begin
-                    else:
-                        utt_begin = 0
-                    if utt != cur_utt and cur_utt is not None:
-                        process_current_phone_labels()
-                        cur_utt = utt
-                        current_labels = []
-
-                    ctm_interval.shift_times(utt_begin)
-                    current_labels.append(ctm_interval)
-            if current_labels:
-                process_current_phone_labels()
-
-        aligner.logger.debug(f"Generating TextGrids for job {j.name}...")
-        processed_files = set()
-        for file in j.job_files().values():
-            first_file_write = True
-            if file.name in processed_files:
-                first_file_write = False
-            try:
-                ctm_to_textgrid(file, aligner, first_file_write)
-                processed_files.add(file.name)
-            except Exception:
-                if aligner.align_config.debug:
-                    raise
-                exc_type, exc_value, exc_traceback = sys.exc_info()
-                export_errors[file.name] = "\n".join(
-                    traceback.format_exception(exc_type, exc_value, exc_traceback)
+            reversed_phone_mapping = phone_arguments.reversed_phone_mappings[dict_name]
+            positions = phone_arguments.positions[dict_name]
+            phone_labels = strip_phone_positions(reversed_phone_mapping, positions)
+            for utt, current_labels in utterance_groups(phone_arguments.ctm_paths[dict_name]):
+                utt.phone_labels = parse_from_phone(
+                    current_labels, reversed_phone_mapping, positions, phone_labels
                 )
+
+        files.update(j.job_files())
+
+    # Files are exported after all jobs are parsed, as a file's speakers can be split across jobs
+    aligner.logger.debug("Generating TextGrids...")
+    for file in files.values():
+        try:
+            ctm_to_textgrid(file, aligner)
+        except Exception:
+            if aligner.align_config.debug:
+                raise
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            export_errors[file.name] = "\n".join(
+                traceback.format_exception(exc_type, exc_value, exc_traceback)
+            )
     if export_errors:
         aligner.logger.warning(
             f"There were {len(export_errors)} errors encountered in generating TextGrids. "
@@ -564,17 +807,16 @@ def output_textgrid_writing_errors(output_directory: str, export_errors: Dict[st
         Dictionary of errors encountered
     """
     error_log = os.path.join(output_directory, "output_errors.txt")
-    if os.path.exists(error_log):
-        os.remove(error_log)
-    for file_name, result in export_errors.items():
-        if not os.path.exists(error_log):
-            with open(error_log, "w", encoding="utf8") as f:
-                f.write(
-                    "The following exceptions were encountered during the output of the alignments to TextGrids:\n\n"
-                )
-        with open(error_log, "a", encoding="utf8") as f:
-            f.write(f"{file_name}:\n")
-            f.write(f"{result}\n\n")
+    if not export_errors:
+        if os.path.exists(error_log):
+            os.remove(error_log)
+        return
+    with open(error_log, "w", encoding="utf8") as f:
+        f.write(
+            "The following exceptions were encountered during the output of the alignments to TextGrids:\n\n"
+        )
+        for file_name, result in export_errors.items():
+            f.write(f"{file_name}:\n{result}\n\n")
 
 
 def generate_tiers(
@@ -607,6 +849,7 @@ def generate_tiers(
         phones = []
         if dictionary_data.multilingual_ipa and cleanup_textgrids:
             phone_ind = 0
+            phone_ends = [p.end for p in u.phone_labels]
             for interval in u.word_labels:
                 end = interval.end
                 word = interval.label
@@ -617,25 +860,24 @@ def generate_tiers(
                     dictionary_data.clitic_set,
                     dictionary_data.clitic_markers,
                     dictionary_data.compound_markers,
+                    dictionary_data.lookup_cache,
                 )
                 subwords = [
                     x if x in dictionary_data.words_mapping else dictionary_data.oov_code
                     for x in subwords
                 ]
                 subprons = [dictionary_data.words[x] for x in subwords]
-                cur_phones = []
-                while u.phone_labels[phone_ind].end <= end:
-                    p = u.phone_labels[phone_ind]
-                    if p.label in dictionary_data.silences:
-                        phone_ind += 1
-                        continue
-                    cur_phones.append(p)
-                    phone_ind += 1
-                    if phone_ind > len(u.phone_labels) - 1:
-                        break
+                prefix_tables = [_get_prefix_table(dictionary_data, x) for x in subwords]
+                next_ind = bisect.bisect_right(phone_ends, end, phone_ind)
+                cur_phones = [
+                    p
+                    for p in u.phone_labels[phone_ind:next_ind]
+                    if p.label not in dictionary_data.silences
+                ]
+                phone_ind = next_ind
                 phones.extend(
                     map_to_original_pronunciation(
-                        cur_phones, subprons, dictionary_data.strip_diacritics
+                        cur_phones, subprons, dictionary_data.strip_diacritics, prefix_tables
                     )
                 )
                 if not word:
@@ -657,6 +899,31 @@ def generate_tiers(
     return output
 
 
+def _to_tg_intervals(intervals: CtmType, duration: float, frame_shift: float) -> List[Interval]:
+    """
+    Convert CtmIntervals to PraatIO Intervals, snapping ends within a frame of the file's
+    end to its duration
+
+    Parameters
+    ----------
+    intervals: CtmType
+        Intervals to convert
+    duration: float
+        Duration of the file
+    frame_shift: float
+        Frame shift of features, in seconds
+
+    Returns
+    -------
+    List[Interval]
+        PraatIO Intervals
+    """
+    return [
+        Interval(x.begin, duration if duration - x.end < frame_shift else x.end, x.label)
+        for x in intervals
+    ]
+
+
 def export_textgrid(
     file: File,
     output_path: str,
@@ -683,53 +950,28 @@ def export_textgrid(
     """
     if frame_shift > 1:
         frame_shift = round(frame_shift / 1000, 4)
+    multi_speaker = len(file.speaker_ordering) > 1
     if first_file_write:
         # Create initial textgrid
         tg = tgio.Textgrid()
         tg.minTimestamp = 0
         tg.maxTimestamp = file.duration
-
-        if len(file.speaker_ordering) > 1:
-            for speaker in file.speaker_ordering:
-                word_tier_name = f"{speaker} - words"
-                phone_tier_name = f"{speaker} - phones"
-
-                word_tier = tgio.IntervalTier(word_tier_name, [], minT=0, maxT=file.duration)
-                phone_tier = tgio.IntervalTier(phone_tier_name, [], minT=0, maxT=file.duration)
-                tg.addTier(word_tier)
-                tg.addTier(phone_tier)
+        if multi_speaker:
+            initial_tiers = [(f"{s} - words", f"{s} - phones") for s in file.speaker_ordering]
         else:
-            word_tier_name = "words"
-            phone_tier_name = "phones"
-            word_tier = tgio.IntervalTier(word_tier_name, [], minT=0, maxT=file.duration)
-            phone_tier = tgio.IntervalTier(phone_tier_name, [], minT=0, maxT=file.duration)
-            tg.addTier(word_tier)
-            tg.addTier(phone_tier)
+            initial_tiers = [("words", "phones")]
     else:
         # Use existing
         tg = tgio.openTextgrid(output_path, includeEmptyIntervals=False)
-
-        word_tier_name = "words"
-        phone_tier_name = "phones"
-        word_tier = tgio.IntervalTier(word_tier_name, [], minT=0, maxT=file.duration)
-        phone_tier = tgio.IntervalTier(phone_tier_name, [], minT=0, maxT=file.duration)
-        tg.addTier(word_tier)
-        tg.addTier(phone_tier)
+        initial_tiers = [("words", "phones")]
+    for word_tier_name, phone_tier_name in initial_tiers:
+        tg.addTier(tgio.IntervalTier(word_tier_name, [], minT=0, maxT=file.duration))
+        tg.addTier(tgio.IntervalTier(phone_tier_name, [], minT=0, maxT=file.duration))
     for speaker, data in speaker_data.items():
-        words = data["words"]
-        phones = data["phones"]
-        tg_words = []
-        tg_phones = []
-        for w in words:
-            if file.duration - w.end < frame_shift:  # Fix rounding issues
-                w.end = file.duration
-            tg_words.append(w.to_tg_interval())
-        for p in phones:
-            if file.duration - p.end < frame_shift:  # Fix rounding issues
-                p.end = file.duration
-            tg_phones.append(p.to_tg_interval())
-
-        if len(file.speaker_ordering) > 1:
+        tg_words = _to_tg_intervals(data["words"], file.duration, frame_shift)
+        tg_phones = _to_tg_intervals(data["phones"], file.duration, frame_shift)
+
+        if multi_speaker:
             word_tier_name = f"{speaker} - words"
             phone_tier_name = f"{speaker} - phones"
         else:
@@ -1,6 +1,7 @@
 """Utility functions for Montreal Forced Aligner"""
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import shutil
@@ -40,6 +41,7 @@ __all__ = [
 ]
 
 
+@functools.lru_cache(maxsize=None)
 def get_mfa_version():
     try:
         from .version import version as __version__  # noqa
@@ -4,9 +4,11 @@ import pytest
 from praatio import textgrid as tgio
 
 from montreal_forced_aligner.command_line.align import load_basic_align, run_align_corpus
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.exceptions import PronunciationAcousticMismatchError
 
+parser = create_parser()
+
 
 def assert_export_exist(old_directory, new_directory):
     for root, dirs, files in os.walk(old_directory):
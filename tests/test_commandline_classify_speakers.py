@@ -1,7 +1,9 @@
 import os
 
 from montreal_forced_aligner.command_line.classify_speakers import run_classify_speakers
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
+
+parser = create_parser()
 
 
 def test_cluster(
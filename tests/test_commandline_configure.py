@@ -1,6 +1,8 @@
 import os
 
-from montreal_forced_aligner.command_line.mfa import create_parser
+import pytest
+
+from montreal_forced_aligner.command_line.mfa import _sniff_subcommand, create_parser
 from montreal_forced_aligner.config import (
     TEMP_DIR,
     generate_config_path,
@@ -107,3 +109,31 @@ def test_configure(
     assert not args.disable_mp
     if os.path.exists(path):
         os.remove(path)
+
+
+def test_sniff_subcommand():
+    assert _sniff_subcommand(["align", "corpus", "train", "output"]) == "align"
+    assert _sniff_subcommand(["train_lm", "-h"]) == "train_lm"
+    assert _sniff_subcommand(["aling", "train", "dict.txt"]) is None
+    assert _sniff_subcommand(["-h", "align"]) is None
+    assert _sniff_subcommand([]) is None
+
+
+def test_create_parser_only(capsys):
+    parser = create_parser(only="train_lm")
+    args, unknown = parser.parse_known_args(["train_lm", "source", "output", "--clean"])
+    assert args.subcommand == "train_lm"
+    assert args.clean
+    with pytest.raises(SystemExit):
+        parser.parse_known_args(["version"])
+    capsys.readouterr()
+
+    # A misspelled subcommand falls back to the full parser, so the error lists every subcommand
+    command = ["aling", "train", "dict.txt"]
+    parser = create_parser(only=_sniff_subcommand(command))
+    with pytest.raises(SystemExit):
+        parser.parse_known_args(command)
+    error = capsys.readouterr().err
+    assert "invalid choice: 'aling'" in error
+    assert "'align'" in error
+    assert "'train_g2p'" in error
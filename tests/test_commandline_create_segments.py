@@ -1,7 +1,9 @@
 import os
 
 from montreal_forced_aligner.command_line.create_segments import run_create_segments
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
+
+parser = create_parser()
 
 
 def test_create_segments(
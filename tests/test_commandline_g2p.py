@@ -3,11 +3,13 @@ import os
 import pytest
 
 from montreal_forced_aligner.command_line.g2p import run_g2p
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.train_g2p import run_train_g2p
 from montreal_forced_aligner.dictionary import Dictionary
 from montreal_forced_aligner.g2p.generator import G2P_DISABLED
 
+parser = create_parser()
+
 
 def test_generate_pretrained(english_g2p_model, basic_corpus_dir, temp_dir, generated_dir):
     if G2P_DISABLED:
@@ -126,3 +128,23 @@ def test_generate_orthography_dict(basic_corpus_dir, orth_sick_output, temp_dir)
     assert os.path.exists(orth_sick_output)
     d = Dictionary(orth_sick_output, temp_dir)
     assert len(d.words) > 0
+
+
+def test_g2p_disabled(monkeypatch, capsys, basic_corpus_dir, sick_dict_path, generated_dir):
+    import montreal_forced_aligner.command_line.g2p
+    import montreal_forced_aligner.command_line.train_g2p
+
+    monkeypatch.setattr(montreal_forced_aligner.command_line.g2p, "G2P_DISABLED", True)
+    monkeypatch.setattr(montreal_forced_aligner.command_line.train_g2p, "G2P_DISABLED", True)
+    output_path = os.path.join(generated_dir, "g2p_disabled")
+    commands = [
+        (run_g2p, ["g2p", "english_g2p", basic_corpus_dir, output_path]),
+        (run_train_g2p, ["train_g2p", sick_dict_path, output_path]),
+    ]
+    for run, command in commands:
+        args, unknown = parser.parse_known_args(command)
+        with pytest.raises(SystemExit) as e:
+            run(args, unknown)
+        assert e.value.code == 1
+        assert "There was an issue importing Pynini" in capsys.readouterr().out
+        assert not os.path.exists(output_path)
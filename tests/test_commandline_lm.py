@@ -1,10 +1,16 @@
 import os
+import subprocess
 import sys
 
 import pytest
 
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.train_lm import run_train_lm
+from montreal_forced_aligner.config import load_basic_train_lm
+from montreal_forced_aligner.exceptions import LMError
+from montreal_forced_aligner.lm.trainer import LmTrainer, _lowercase_arpa, _wait_for_processes
+
+parser = create_parser()
 
 
 def test_train_lm(basic_corpus_dir, temp_dir, generated_dir, basic_train_lm_config):
@@ -66,3 +72,79 @@ def test_train_lm_text_no_mp(basic_split_dir, temp_dir, generated_dir, basic_tra
     args, unknown = parser.parse_known_args(command)
     run_train_lm(args)
     assert os.path.exists(args.output_model_path)
+
+
+def test_lowercase_arpa_crlf(generated_dir):
+    arpa_path = os.path.join(generated_dir, "crlf.arpa")
+    lowered_path = os.path.join(generated_dir, "crlf_lowered.arpa")
+    lines = ["\\data\\", "ngram 1=3", "", "\\1-grams:", "-1.0\t<S>", "-1.0\tÉTÉ\t-0.5", "\\end\\"]
+    with open(arpa_path, "wb") as f:
+        f.write("\r\n".join(lines).encode("utf8") + b"\r\n")
+    with open(arpa_path, "r", encoding="utf8") as f:
+        expected = f.read().lower().encode("utf8")
+    # Small chunks split lines, multi-byte characters and CRLF pairs across reads
+    for chunk_size in [1, 2, 3, 7, 1 << 20]:
+        with open(arpa_path, "rb") as inf, open(lowered_path, "wb") as outf:
+            _lowercase_arpa(inf, outf, chunk_size)
+        with open(lowered_path, "rb") as f:
+            lowered = f.read()
+        assert b"\r" not in lowered
+        assert lowered == expected
+
+
+def test_wait_for_processes():
+    def python_proc(code, **kwargs):
+        return subprocess.Popen([sys.executable, "-c", code], **kwargs)
+
+    _wait_for_processes([python_proc("pass"), python_proc("pass")], "train.log")
+
+    # The first failure is reported only once the slower process has finished too
+    procs = [python_proc("raise SystemExit(3)"), python_proc("import time; time.sleep(0.5)")]
+    with pytest.raises(LMError, match="exited with code 3"):
+        _wait_for_processes(procs, "train.log")
+    assert all(proc.returncode is not None for proc in procs)
+
+    # Producers are checked before the process reading from them
+    producer = python_proc("raise SystemExit(4)", stdout=subprocess.PIPE)
+    consumer = python_proc("import sys; sys.stdin.read()", stdin=producer.stdout)
+    producer.stdout.close()
+    with pytest.raises(LMError, match="exited with code 4"):
+        _wait_for_processes([producer, consumer], "train.log")
+
+
+STUB_OPENGRM = """#!{executable}
+import os
+import sys
+
+args = [x for x in sys.argv[1:] if not x.startswith("--")]
+if os.path.basename(sys.argv[0]) == "ngramperplexity":
+    sys.exit(0 if all(os.path.exists(x) for x in args) else 1)
+if args[0] == "-":
+    sys.stdin.buffer.read()
+with open(args[-1], "w", encoding="utf8") as f:
+    f.write("\\\\data\\\\\\nngram 1=1\\n\\n\\\\1-grams:\\n-1.0\\t<s>\\n\\n\\\\end\\\\\\n")
+"""
+
+
+def test_train_lm_arpa_source(generated_dir, temp_dir, monkeypatch):
+    if sys.platform == "win32":
+        pytest.skip("LM training not supported on Windows.")
+    # Stand-ins for the OpenGrm binaries, ngramperplexity fails without a training FAR
+    bin_dir = os.path.join(generated_dir, "opengrm_stubs")
+    os.makedirs(bin_dir, exist_ok=True)
+    for name in ["ngramread", "ngramprint", "ngramshrink", "ngramperplexity"]:
+        path = os.path.join(bin_dir, name)
+        with open(path, "w", encoding="utf8") as f:
+            f.write(STUB_OPENGRM.format(executable=sys.executable))
+        os.chmod(path, 0o755)
+    monkeypatch.setenv("PATH", bin_dir + os.pathsep + os.environ["PATH"])
+
+    arpa_path = os.path.join(generated_dir, "source.arpa")
+    with open(arpa_path, "w", encoding="utf8") as f:
+        f.write("\\data\\\nngram 1=1\n\n\\1-grams:\n-1.0\t<S>\n\n\\end\\\n")
+    output_model_path = os.path.join(generated_dir, "arpa_source_lm.zip")
+    trainer = LmTrainer(
+        arpa_path, load_basic_train_lm(), output_model_path, temp_directory=temp_dir
+    )
+    trainer.train()
+    assert os.path.exists(output_model_path)
@@ -2,9 +2,11 @@ import os
 
 import pytest
 
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.train_acoustic_model import run_train_acoustic_model
 
+parser = create_parser()
+
 
 # @pytest.mark.skip(reason='Optimization')
 def test_train_and_align_basic(
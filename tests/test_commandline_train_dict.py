@@ -1,8 +1,10 @@
 import os
 
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.train_dictionary import run_train_dictionary
 
+parser = create_parser()
+
 
 def test_train_dict(
     basic_corpus_dir,
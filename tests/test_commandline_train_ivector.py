@@ -1,10 +1,12 @@
 import os
 
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.train_ivector_extractor import (
     run_train_ivector_extractor,
 )
 
+parser = create_parser()
+
 
 # @pytest.mark.skip(reason='Optimization')
 def test_basic_ivector(
@@ -3,9 +3,11 @@ import sys
 
 import pytest
 
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.transcribe import run_transcribe_corpus
 
+parser = create_parser()
+
 
 def test_transcribe(
     basic_corpus_dir,
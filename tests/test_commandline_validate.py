@@ -1,6 +1,8 @@
-from montreal_forced_aligner.command_line.mfa import parser
+from montreal_forced_aligner.command_line.mfa import create_parser
 from montreal_forced_aligner.command_line.validate import run_validate_corpus
 
+parser = create_parser()
+
 
 def test_validate_corpus(large_prosodylab_format_directory, large_dataset_dictionary, temp_dir):
 
@@ -1,11 +1,19 @@
 import os
+import shutil
+from datetime import datetime
 
 import pytest
+import yaml
 
 from montreal_forced_aligner.config import (
     FeatureConfig,
+    _read_last_lines,
     align_yaml_to_config,
+    generate_command_history_path,
+    load_command_history,
+    train_lm_yaml_to_config,
     train_yaml_to_config,
+    update_command_history,
 )
 from montreal_forced_aligner.exceptions import ConfigError
 from montreal_forced_aligner.trainers import (
@@ -96,6 +104,14 @@ def test_load_ivector_train(config_directory, train_ivector_config):
     assert not align.feature_config.use_mp
 
 
+def test_load_train_lm(basic_train_lm_config):
+    config = train_lm_yaml_to_config(basic_train_lm_config)
+    assert config.order == 3
+    assert config.prune
+    config.order = 5
+    assert train_lm_yaml_to_config(basic_train_lm_config).order == 3
+
+
 def test_load(config_directory):
     path = os.path.join(config_directory, "basic_train_config.yaml")
     train, align = train_yaml_to_config(path)
@@ -117,3 +133,106 @@ def test_multilingual_ipa(config_directory):
     assert align.multilingual_ipa
     assert set(align.strip_diacritics) == set(DEFAULT_STRIP_DIACRITICS)
     assert align.digraphs == ["[dt][szʒʃʐʑʂɕç]", "[a][job_name][u]"]
+
+
+@pytest.fixture()
+def history_dir(generated_dir, monkeypatch):
+    import montreal_forced_aligner.config
+
+    path = os.path.join(generated_dir, "history")
+    shutil.rmtree(path, ignore_errors=True)
+    monkeypatch.setattr(montreal_forced_aligner.config, "TEMP_DIR", path)
+    return path
+
+
+def test_read_last_lines(generated_dir):
+    path = os.path.join(generated_dir, "last_lines.txt")
+    lines = [f"line {i} {'x' * (i * 7 % 23)}".encode("utf8") for i in range(20)]
+    for trailing_newline in [True, False]:
+        with open(path, "wb") as f:
+            f.write(b"\n".join(lines) + (b"\n" if trailing_newline else b""))
+        # Small chunk sizes make lines cross the boundaries between reads
+        for chunk_size in [1, 5, 16, 8192]:
+            for depth in [0, 1, 5, 19, 20, 21, 100]:
+                expected = lines[-depth:] if depth else []
+                assert _read_last_lines(path, depth, chunk_size) == expected
+
+
+def test_command_history(history_dir):
+    assert load_command_history() == []
+    assert load_command_history(5) == []
+    date = datetime(2021, 9, 1, 12, 30, 15, 123456)
+    commands = []
+    for i in range(10):
+        command_data = {
+            "command": f"mfa align corpus_{i} english english output",
+            "execution_time": i * 1.5,
+            "date": date,
+            "version": "2.0.0",
+            "exit_code": 0,
+        }
+        update_command_history(command_data)
+        commands.append(command_data)
+    update_command_history({"command": "mfa history", "date": date})
+    update_command_history({"command": "mfa", "date": date})
+    history = load_command_history()
+    assert history == commands
+    assert isinstance(history[0]["date"], datetime)
+    assert load_command_history(0) == []
+    assert load_command_history(3) == commands[-3:]
+    assert load_command_history(10) == commands
+    assert load_command_history(50) == commands
+
+
+def test_command_history_trim(history_dir):
+    date = datetime(2021, 9, 1, 12, 30, 15)
+    padding = "x" * 10000
+    for i in range(120):
+        update_command_history(
+            {"command": f"mfa align corpus_{i} {padding}", "date": date, "exit_code": 0}
+        )
+    path = generate_command_history_path()
+    assert os.path.getsize(path) <= 1 << 20
+    history = load_command_history()
+    assert len(history) < 120
+    assert history[-1]["command"] == f"mfa align corpus_119 {padding}"
+    assert [x["command"] for x in history] == [
+        f"mfa align corpus_{i} {padding}" for i in range(120 - len(history), 120)
+    ]
+
+
+def test_command_history_legacy_yaml(history_dir):
+    date = datetime(2021, 9, 1, 12, 30, 15, 123456)
+    commands = [
+        {
+            "command": f"mfa align corpus_{i} english english output",
+            "execution_time": 1.5,
+            "date": date,
+            "version": "2.0.0",
+            "exit_code": 0,
+            "exception": "",
+        }
+        for i in range(3)
+    ]
+    os.makedirs(history_dir, exist_ok=True)
+    with open(os.path.join(history_dir, "command_history.yaml"), "w", encoding="utf8") as f:
+        yaml.safe_dump(commands, f)
+    assert load_command_history() == commands
+    assert os.path.exists(generate_command_history_path())
+    update_command_history(dict(commands[0], command="mfa validate corpus english"))
+    history = load_command_history()
+    assert history[:3] == commands
+    assert history[-1]["command"] == "mfa validate corpus english"
+
+
+def test_command_history_truncated_line(history_dir):
+    date = datetime(2021, 9, 1, 12, 30, 15)
+    for i in range(3):
+        update_command_history({"command": f"mfa align corpus_{i}", "date": date})
+    path = generate_command_history_path()
+    with open(path, "a", encoding="utf8") as f:
+        f.write('{"command": "mfa align corpus_3", "da')
+    assert [x["command"] for x in load_command_history()] == [
+        f"mfa align corpus_{i}" for i in range(3)
+    ]
+    assert [x["command"] for x in load_command_history(2)] == ["mfa align corpus_2"]
@@ -6,7 +6,7 @@ from montreal_forced_aligner.dictionary import (
     parse_ipa,
     sanitize,
 )
-from montreal_forced_aligner.textgrid import split_clitics
+from montreal_forced_aligner.textgrid import CtmInterval, parse_from_word, split_clitics
 
 
 def ListLines(path):
@@ -138,6 +138,43 @@ def test_frclitics(frclitics_dict_path, generated_dir):
     assert d.to_int("flying'purple-people-eater") == [d.oov_int]
 
 
+def test_dictionary_data_caches(frclitics_dict_path, generated_dir):
+    d = Dictionary(frclitics_dict_path, os.path.join(generated_dir, "frclitics_caches"))
+    d.generate_mappings()
+    data = d.data()
+    speaker_data = d.data({"m'appelle"})
+    assert data.lookup_cache is not speaker_data.lookup_cache
+    assert data.int_cache is not speaker_data.int_cache
+
+    text = ["m'appelle", "vingt-six"]
+    ids = [d.words_mapping[x] for x in ["m'", "appelle", "vingt", "six"]]
+    expected = [
+        CtmInterval(0.0, 0.2, "m'appelle", "utt"),
+        CtmInterval(0.2, 0.4, "vingt-six", "utt"),
+    ]
+    for _ in range(2):
+        ctm_labels = [CtmInterval(i / 10, (i + 1) / 10, str(x), "utt") for i, x in enumerate(ids)]
+        assert parse_from_word(ctm_labels, text, data) == expected
+    assert data.lookup_cache == {"m'appelle": ("m'", "appelle"), "vingt-six": ("vingt", "six")}
+    assert data.int_cache == {"m'appelle": tuple(ids[:2]), "vingt-six": tuple(ids[2:])}
+    assert not speaker_data.lookup_cache
+    assert not speaker_data.int_cache
+
+
+def test_parse_from_word_oov(frclitics_dict_path, generated_dir):
+    d = Dictionary(frclitics_dict_path, os.path.join(generated_dir, "frclitics_oov"))
+    d.generate_mappings()
+    data = d.data()
+    text = ["m'appelle", "bonjour", "vingt-six"]
+    ids = [d.words_mapping[x] for x in ["m'", "appelle", d.oov_code, "vingt", "six"]]
+    ctm_labels = [CtmInterval(i / 10, (i + 1) / 10, str(x), "utt") for i, x in enumerate(ids)]
+    assert parse_from_word(ctm_labels, text, data) == [
+        CtmInterval(0.0, 0.2, "m'appelle", "utt"),
+        CtmInterval(0.2, 0.3, "bonjour", "utt"),
+        CtmInterval(0.3, 0.5, "vingt-six", "utt"),
+    ]
+
+
 def test_english_clitics(english_pretrained_dictionary, generated_dir):
     d = Dictionary(
         english_pretrained_dictionary, os.path.join(generated_dir, "english_clitic_test")
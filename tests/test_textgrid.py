@@ -1,5 +1,23 @@
+import os
+
+import pytest
+
 from montreal_forced_aligner.config.base_config import DEFAULT_STRIP_DIACRITICS
-from montreal_forced_aligner.textgrid import CtmInterval, map_to_original_pronunciation
+from montreal_forced_aligner.corpus.classes import File, Speaker, Utterance
+from montreal_forced_aligner.dictionary import Dictionary
+from montreal_forced_aligner.textgrid import (
+    CtmInterval,
+    _build_prefix_table,
+    _diacritic_table,
+    _get_prefix_table,
+    _merge_subword_spans,
+    generate_tiers,
+    map_to_original_pronunciation,
+    output_textgrid_writing_errors,
+    parse_ctm_file,
+    parse_from_phone,
+    strip_phone_positions,
+)
 
 
 def test_mapping():
@@ -47,3 +65,200 @@ def test_mapping():
         CtmInterval(2.71, 2.84, "aɪ", u),
         CtmInterval(2.84, 2.92, "k", u),
     ]
+
+
+def test_prefix_table():
+    prons = [
+        {"pronunciation": ("t",)},
+        {"pronunciation": ("t", "ʃ"), "original_pronunciation": ("tʃ",)},
+        {"pronunciation": ("t",), "original_pronunciation": ("tʰ",)},
+    ]
+    table, lengths = _build_prefix_table(prons)
+    assert table == {("t",): [(0, prons[0]), (2, prons[2])], ("t", "ʃ"): [(1, prons[1])]}
+    assert sorted(lengths) == [1, 2]
+
+
+def test_mapping_prefix_order():
+    u = "utt"
+    affricate = {"pronunciation": ("t", "ʃ"), "original_pronunciation": ("tʃ",)}
+    aspirated = {"pronunciation": ("t",), "original_pronunciation": ("tʰ",)}
+    vowel = [{"pronunciation": ("a",), "original_pronunciation": ("a",)}]
+    # The first listed pronunciation that is a prefix of the phones is used, not the longest,
+    # so with the aspirated entry first the vowel no longer lines up and the phones are kept
+    expected = {
+        0: [CtmInterval(0.0, 0.2, "tʃ", u), CtmInterval(0.2, 0.3, "a", u)],
+        1: [
+            CtmInterval(0.0, 0.1, "t", u),
+            CtmInterval(0.1, 0.2, "ʃ", u),
+            CtmInterval(0.2, 0.3, "a", u),
+        ],
+    }
+    for first, prons in enumerate([[affricate, aspirated], [aspirated, affricate]]):
+        subprons = [prons, vowel]
+        for prefix_tables in (None, [_build_prefix_table(x) for x in subprons]):
+            cur_phones = [
+                CtmInterval(0.0, 0.1, "t", u),
+                CtmInterval(0.1, 0.2, "ʃ", u),
+                CtmInterval(0.2, 0.3, "a", u),
+            ]
+            new_phones = map_to_original_pronunciation(
+                cur_phones, subprons, DEFAULT_STRIP_DIACRITICS, prefix_tables
+            )
+            assert new_phones == expected[first]
+
+
+def test_mapping_full_match():
+    u = "utt"
+    cur_phones = [CtmInterval(0.0, 0.1, "l", u), CtmInterval(0.1, 0.2, "a", u)]
+    subprons = [
+        [
+            {"pronunciation": ("l", "a"), "original_pronunciation": ("lː", "a")},
+            {"pronunciation": ("l", "a")},
+        ]
+    ]
+    assert map_to_original_pronunciation(cur_phones, subprons, DEFAULT_STRIP_DIACRITICS) == [
+        CtmInterval(0.0, 0.1, "l", u),
+        CtmInterval(0.1, 0.2, "a", u),
+    ]
+
+
+def test_prefix_tables_on_dictionary_data(frclitics_dict_path, generated_dir):
+    d = Dictionary(frclitics_dict_path, os.path.join(generated_dir, "frclitics_prefix"))
+    d.generate_mappings()
+    data = d.data()
+    table = _get_prefix_table(data, "vingt")
+    assert table == _build_prefix_table(data.words["vingt"])
+    assert data.prefix_tables["vingt"] is table
+    assert _get_prefix_table(data, "vingt") is table
+    assert not d.data().prefix_tables
+
+
+def test_parse_from_phone(frclitics_dict_path, generated_dir):
+    d = Dictionary(frclitics_dict_path, os.path.join(generated_dir, "frclitics_phones"))
+    d.generate_mappings()
+    reversed_phone_mapping = d.reversed_phone_mapping
+    phone_labels = strip_phone_positions(reversed_phone_mapping, d.positions)
+    assert phone_labels[d.phone_mapping["m_B"]] == "m"
+    assert phone_labels[d.phone_mapping["sil"]] == "sil"
+    phone_ids = [d.phone_mapping[x] for x in ["sil", "m_B", "a_E"]]
+    for labels in [None, phone_labels]:
+        ctm_labels = [
+            CtmInterval(i / 10, (i + 1) / 10, str(x), "utt") for i, x in enumerate(phone_ids)
+        ]
+        parsed = parse_from_phone(ctm_labels, reversed_phone_mapping, d.positions, labels)
+        assert [x.label for x in parsed] == ["sil", "m", "a"]
+
+
+def test_parse_ctm_file(generated_dir):
+    path = os.path.join(generated_dir, "normal.ctm")
+    with open(path, "w", encoding="utf8") as f:
+        f.write("utt1 1 0.00 0.12 5\n\nutt1 1 0.12 0.25 7\nutt2 1 1.5 0.333333 9\n")
+    assert parse_ctm_file(path) == [
+        CtmInterval(0.0, 0.12, "5", "utt1"),
+        CtmInterval(0.12, 0.37, "7", "utt1"),
+        CtmInterval(1.5, 1.8333, "9", "utt2"),
+    ]
+    with open(path, "w", encoding="utf8") as f:
+        f.write("")
+    assert parse_ctm_file(path) == []
+
+
+def test_parse_ctm_file_malformed(generated_dir):
+    path = os.path.join(generated_dir, "malformed.ctm")
+    malformed = [
+        "utt1 1 0.00 0.12\nutt1 1 0.12 0.25 7\n",
+        # Ten fields in total, but the label lands in the duration column when read by column
+        "utt1 1 0.00 0.12\nutt1 1 0.12 0.25 sil 1.0\n",
+    ]
+    for data in malformed:
+        with open(path, "w", encoding="utf8") as f:
+            f.write(data)
+        with pytest.raises(IndexError):
+            parse_ctm_file(path)
+    # Extra fields such as confidences are ignored rather than shifting the columns
+    with open(path, "w", encoding="utf8") as f:
+        f.write("utt1 1 0.00 0.12 5 0.9\nutt1 1 0.12 0.25 7 1.0\nutt1 1 0.37 0.1 8\n")
+    assert parse_ctm_file(path) == [
+        CtmInterval(0.0, 0.12, "5", "utt1"),
+        CtmInterval(0.12, 0.37, "7", "utt1"),
+        CtmInterval(0.37, 0.47, "8", "utt1"),
+    ]
+
+
+def test_merge_subword_spans():
+    label_ints = [1, 2, 3, 9, 4, 8, 6]
+    begins = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+    ends = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
+    word_ints = [[1], [2, 3], [5], [4], [7, 6]]
+    assert _merge_subword_spans(label_ints, begins, ends, word_ints) == [
+        (0.0, 0.1),
+        (0.1, 0.3),
+        (1000000, -1),
+        (0.4, 0.5),
+        (0.6, 0.7),
+    ]
+    assert _merge_subword_spans([], [], [], []) == []
+
+
+def test_generate_tiers(frclitics_dict_path, generated_dir):
+    d = Dictionary(
+        frclitics_dict_path, os.path.join(generated_dir, "frclitics_tiers"), multilingual_ipa=True
+    )
+    d.generate_mappings()
+    speaker = Speaker("speaker")
+    speaker.dictionary_data = d.data()
+    file = File(text_path=os.path.join(generated_dir, "tiers.lab"))
+    u = Utterance(speaker, file, begin=0, end=1.2, text="appelle six")
+    u.word_labels = [
+        CtmInterval(0.1, 0.5, "appelle", "utt"),
+        CtmInterval(0.6, 0.9, "six", "utt"),
+    ]
+    labels = ["sil", "a", "p", "3", "l", "sil", "s", "i", "s", "sil"]
+    bounds = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.2]
+    u.phone_labels = [
+        CtmInterval(bounds[i], bounds[i + 1], x, "utt") for i, x in enumerate(labels)
+    ]
+    tiers = generate_tiers(file)
+    assert tiers[speaker]["words"] == u.word_labels
+    # Phones ending exactly at a word's end belong to that word, silences are dropped
+    assert tiers[speaker]["phones"] == [
+        x for x in u.phone_labels if x.label != "sil" and x.end <= 0.9
+    ]
+    tiers = generate_tiers(file, cleanup_textgrids=False)
+    assert tiers[speaker]["phones"] == u.phone_labels
+
+
+def test_mapping_multi_character_diacritics():
+    assert _diacritic_table(("ː", "ʰ")) == str.maketrans("", "", "ːʰ")
+    assert _diacritic_table(("ː", "ʰʷ")) is None
+    subprons = [[{"pronunciation": ("k", "a", "d"), "original_pronunciation": ("kʰʷ", "aː", "d")}]]
+    expected = {
+        ("ʰ", "ʷ", "ː"): ["kʰʷ", "aː", "d"],
+        ("ʰʷ", "ː"): ["kʰʷ", "aː", "d"],
+        # Multi-character diacritics are only stripped as a whole
+        ("ʷʰ", "ː"): ["aː", "d"],
+    }
+    for strip_diacritics, labels in expected.items():
+        phones = [CtmInterval(i / 10, (i + 1) / 10, x, "utt") for i, x in enumerate("kad")]
+        result = map_to_original_pronunciation(phones, subprons, list(strip_diacritics))
+        assert [x.label for x in result] == labels
+
+
+def test_output_textgrid_writing_errors(generated_dir):
+    output_directory = os.path.join(generated_dir, "textgrid_errors")
+    os.makedirs(output_directory, exist_ok=True)
+    error_log = os.path.join(output_directory, "output_errors.txt")
+    export_errors = {"file1": "Traceback 1", "file2": "Traceback 2"}
+    output_textgrid_writing_errors(output_directory, export_errors)
+    with open(error_log, "r", encoding="utf8") as f:
+        assert f.read() == (
+            "The following exceptions were encountered during the output of the alignments to TextGrids:\n\n"
+            "file1:\nTraceback 1\n\n"
+            "file2:\nTraceback 2\n\n"
+        )
+    # Errors from a previous run are replaced rather than appended to
+    output_textgrid_writing_errors(output_directory, {"file3": "Traceback 3"})
+    with open(error_log, "r", encoding="utf8") as f:
+        assert f.read().endswith("TextGrids:\n\nfile3:\nTraceback 3\n\n")
+    output_textgrid_writing_errors(output_directory, {})
+    assert not os.path.exists(error_log)